@@ -1 +1,6 @@
-__all__ = ['tools', 'search', 'fit', 'starpars','lightcurve','starpars']
\ No newline at end of file
+# Submodules are imported on first attribute access, so e.g. `MonoTools.fit` works after
+# a plain `import MonoTools` without an explicit `from MonoTools import fit`.
+# The public names are listed in __init__.pyi.
+import lazy_loader as lazy
+
+__getattr__, __dir__, __all__ = lazy.attach_stub(__name__, __file__)
@@ -0,0 +1,5 @@
+from . import tools
+from . import search
+from . import fit
+from . import starpars
+from . import lightcurve
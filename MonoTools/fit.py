@@ -1,9 +1,18 @@
-import exoplanet as xo
+try:
+    import exoplanet as xo
+    from iteround import saferound
+    import theano.tensor as tt
+    import pymc3 as pm
+    import pymc3_ext as pmx
+    import theano
+    from celerite2.theano import terms as theano_terms
+    import celerite2.theano
+except ImportError as err:
+    raise ImportError("MonoTools.fit needs the modelling dependencies. Install them with `pip install MonoTools[model]`") from err
 
 import numpy as np
 import matplotlib.pyplot as plt
 import pandas as pd
-from iteround import saferound
 
 from astropy.io import fits
 from astropy.io import ascii
@@ -73,13 +82,6 @@ for key in theano_pars:
 #setting float type:
 floattype=np.float64
 
-import theano.tensor as tt
-import pymc3 as pm
-import pymc3_ext as pmx
-import theano
-from celerite2.theano import terms as theano_terms
-import celerite2.theano
-
 theano.config.print_test_value = True
 theano.config.exception_verbosity='high'
 
@@ -152,8 +154,7 @@ class monoModel():
                 else:
                     setattr(self,param,self.defaults[param])
 
-        self.id_dic={'TESS':'TIC','tess':'TIC','Kepler':'KIC','kepler':'KIC','KEPLER':'KIC',
-                     'K2':'EPIC','k2':'EPIC','CoRoT':'CID','corot':'CID'}
+        self.id_dic=tools.id_dic
         ID=ID.replace('_','') if type(ID)==str and '_' in ID else ID
         ID=ID.replace(' ','') if type(ID)==str and ' ' in ID else ID
         self.ID=ID
@@ -1384,24 +1385,23 @@ class monoModel():
     def init_interpolated_Mp_prior(self):
         """Initialise a 2D interpolated prior for the mass of a planet given the radius
         """
-        MRarray=np.genfromtxt(os.path.join(MonoData_tablepath,"LogMePriorFromRe.txt"))
-        self.interpolated_mu = xo.interp.RegularGridInterpolator([np.hstack((0.01,MRarray[:,0])).astype(np.float64)],
-                                                                  np.hstack((np.log(0.1),MRarray[:,1])).astype(np.float64)[:, None])
-        self.interpolated_sigma = xo.interp.RegularGridInterpolator([np.hstack((0.01,MRarray[:,0])).astype(np.float64)],
-                                                                     np.hstack((1.25,MRarray[:,2])).astype(np.float64)[:, None])
+        MRarray=np.genfromtxt(os.path.join(MonoData_tablepath,"LogMePriorFromRe.txt"),dtype=np.float64)
+        rad_grid=np.hstack((0.01,MRarray[:,0]))
+        self.interpolated_mu = xo.interp.RegularGridInterpolator([rad_grid],
+                                                                  np.hstack((np.log(0.1),MRarray[:,1]))[:, None])
+        self.interpolated_sigma = xo.interp.RegularGridInterpolator([rad_grid],
+                                                                     np.hstack((1.25,MRarray[:,2]))[:, None])
 
     def init_interpolated_v_prior(self):
         """Initialise the interpolated functions for log prob vs log velocity and marginalised eccentricity vs log velocity
         """
-        import gzip
-        import io
-
         #Four potential sources of data:
         interp_locs={'kipping':"kip", 'vaneylen':"vve",'flat':"flat",'apogee':'apo'}
         interp_locs['auto']='vve' if len(self.planets)>1 else 'kip'
-        f_emarg=gzip.open(os.path.join(MonoData_tablepath,
-                                                  "emarg_array_"+interp_locs[self.ecc_prior.lower()]+".txt.gz"), "rb")
-        emarg_arr  = np.genfromtxt(io.BytesIO(f_emarg.read()))
+        #These are ~16000x98 whitespace-delimited tables, so we use pandas' C parser rather than np.genfromtxt
+        # (round_trip precision gives bit-identical floats to genfromtxt)
+        emarg_arr  = pd.read_csv(os.path.join(MonoData_tablepath,"emarg_array_"+interp_locs[self.ecc_prior.lower()]+".txt.gz"),
+                                 sep=r'\s+', header=None, compression='gzip', dtype=np.float64, float_precision='round_trip').values
         #pd.read_csv(os.path.join(MonoData_tablepath,"emarg_array_"+interp_locs[self.ecc_prior.lower()]+".csv"),
         #                          index_col=0)
         emarg_arr  = np.nan_to_num(emarg_arr,1.025)
@@ -1411,9 +1411,8 @@ class monoModel():
                                                                       np.column_stack((np.tile(1.025,len(emarg_arr[1:,0])),
                                                                                        emarg_arr[1:,1:]))[:,:],
                                                                       nout=1)
-        f_logprob=gzip.open(os.path.join(MonoData_tablepath,
-                                         "logprob_array_"+interp_locs[self.ecc_prior.lower()]+".txt.gz"),"rb")
-        logprob_arr=np.genfromtxt(io.BytesIO(f_logprob.read()))
+        logprob_arr = pd.read_csv(os.path.join(MonoData_tablepath,"logprob_array_"+interp_locs[self.ecc_prior.lower()]+".txt.gz"),
+                                  sep=r'\s+', header=None, compression='gzip', dtype=np.float64, float_precision='round_trip').values
 
         #np.genfromtxt(os.path.join(MonoData_tablepath,"logprob_array_"+interp_locs[self.ecc_prior.lower()]+".txt"))
         #logprob_arr = pd.read_csv(os.path.join(MonoData_tablepath,"logprob_array_"+interp_locs[self.ecc_prior.lower()]+".csv"),
@@ -4908,11 +4907,12 @@ class monoModel():
         if check_TESS:
             sect_start_ends=self.CheckTESS()
         
-        all_trans_fin=pd.DataFrame()
+        #Collecting per-planet/per-alias tables in lists and concatenating once (rather than re-copying with .append each loop)
+        all_trans_fin=[]
         loopplanets = self.duos+self.trios+self.multis if include_multis else self.duos+self.trios
         
         for pl in loopplanets:
-            all_trans=pd.DataFrame()
+            all_trans=[]
             if pl in self.duos+self.trios:
                 sum_all_probs=np.logaddexp.reduce(np.nanmedian(self.trace['logprob_marg_'+pl],axis=0))
                 trans_p0=np.floor(np.nanmedian(time_start - self.trace['t0_2_'+pl])/np.nanmedian(self.trace['per_'+pl],axis=0))
@@ -4970,7 +4970,8 @@ class monoModel():
                                       'planet_name':np.tile('multi_'+pl,len(transits[2])) if pl in self.multis else np.tile('duo_'+pl,len(transits[2])),
                                       'alias_n':np.tile(nd,len(transits[2])),
                                       'alias_p':np.tile(np.nanmedian(self.trace['per_'+pl][:,nd]),len(transits[2])) if pl in self.duos+self.trios else np.nanmedian(self.trace['per_'+pl])})
-                    all_trans=all_trans.append(idf)
+                    all_trans+=[idf]
+            all_trans=pd.concat(all_trans)
             unq_trans = all_trans.sort_values('log_prob').copy().drop_duplicates('transit_fractions')
             unq_trans = unq_trans.set_index(np.arange(len(unq_trans)))
             unq_trans['aliases_ns']=unq_trans['alias_n'].values.astype(str)
@@ -4984,7 +4985,8 @@ class monoModel():
                 unq_trans.loc[i,'aliases_ps']=','.join(list(np.round(oths['alias_p'].values,4).astype(str)))
                 unq_trans.loc[i,'num_aliases']=len(oths)
                 unq_trans.loc[i,'total_prob']=np.sum(oths['prob'].values)
-            all_trans_fin=all_trans_fin.append(unq_trans)
+            all_trans_fin+=[unq_trans]
+        all_trans_fin = pd.concat(all_trans_fin) if len(all_trans_fin)>0 else pd.DataFrame()
         all_trans_fin = all_trans_fin.loc[(all_trans_fin['transit_end_+2sig']>time_start)*(all_trans_fin['transit_start_-2sig']<time_end)].sort_values('transit_mid_med')
         all_trans_fin = all_trans_fin.set_index(np.arange(len(all_trans_fin)))
 
@@ -5011,7 +5013,8 @@ class monoModel():
         """
         from tess_stars2px import tess_stars2px_function_entry as tess_stars2px
         from astropy.time import Time
-        result = tess_stars2px(self.lc.all_ids['tess']['id'], self.lc.radec.ra.deg, self.lc.radec.dec.deg)
+        #Re-using the session-wide spacecraft pointing model rather than rebuilding every sector's camera/FPG set-up:
+        result = tess_stars2px(self.lc.all_ids['tess']['id'], self.lc.radec.ra.deg, self.lc.radec.dec.deg, scInfo=tools.get_tess_scinfo())
         sectdiffs=np.diff(result[-1].midtimes)
         sectdiffs=np.hstack((sectdiffs[0],0.5*(sectdiffs[:-1]+sectdiffs[1:]),sectdiffs[-1]))
         future_sect_ix=np.isin(result[-1].sectors,result[3])&(result[-1].midtimes>Time.now().jd)
@@ -5023,7 +5026,7 @@ class monoModel():
         #RMS polynomial fits for 3 hour durations:
         rms_brightfit = np.array([ 2.49847572, -6.41232409])
         rms_faintfit = np.array([  30.2599025 , -256.41381477])
-        rms = np.max([np.polyval(rms_faintfit,Gmag),np.polyval(rms_brightfit,Gmag)])
+        rms = max(np.polyval(rms_faintfit,Gmag),np.polyval(rms_brightfit,Gmag))
         return rms/np.sqrt(tdur/0.125)
 
     def MakeCheopsOR(self, DR2ID=None, pl=None, min_eff=45, oot_min_orbits=1.0, timing_sigma=3, t_start=None, t_end=None, Texp=None,
@@ -5132,7 +5135,7 @@ class monoModel():
             t_start=2457000+np.max(all_trans.loc[all_trans['in_TESS'],"transit_mid_med"].values)+0.5
             outfilesuffix=outfilesuffix.replace('.csv',"_postTESS.csv")
         #print(Time(t_end,format='jd').isot,t_end,Time(t_start,format='jd').isot,t_start)
-        out_tab=pd.DataFrame()
+        out_tab=[]
         if pl is None:
             searchpls=list(self.planets.keys())
         else:
@@ -5254,7 +5257,8 @@ class monoModel():
                     #ser["EndPh1"]=((row['end_earliest']-row['mid'])/100)
                     #ser["Effic1"]=50
                     ser['N_Ranges']=0
-                    out_tab=out_tab.append(pd.Series(ser,name=nper))
+                    out_tab+=[pd.Series(ser,name=nper)]
+        out_tab=pd.DataFrame(out_tab)
         out_tab['MinEffDur']=out_tab['MinEffDur'].values.astype(int)
         #print(98.77*60*out_tab['T_visit'].values)
         out_tab['T_visit']=(98.77*60*out_tab['T_visit'].values).astype(int) #in seconds
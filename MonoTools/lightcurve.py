@@ -9,11 +9,8 @@ from copy import deepcopy
 from datetime import datetime
 
 from scipy.signal import savgol_filter
-import exoplanet as xo
 import scipy.interpolate as interp
 import scipy.optimize as optim
-import matplotlib.pyplot as plt
-import matplotlib
 
 from astropy import units
 from astropy.coordinates.sky_coordinate import SkyCoord
@@ -26,7 +23,6 @@ from astropy.io import fits
 
 from . import tools, starpars
 
-import seaborn as sns
 import logging
 logging.getLogger('matplotlib.font_manager').disabled = True
 logging.getLogger("httplib2").setLevel(logging.WARNING)
@@ -635,7 +631,7 @@ class lc():
         # Step 2 - Loop through cadences and round/cut into 3. 
         # Step 3 - calculate gaps between cadences, cut up plot to hide gaps.
 
-
+        import matplotlib.pyplot as plt
         fig=plt.figure(figsize=(11.69,8.27)) #A4 page: 8.27 x 11.69
         ax=fig.add_subplot(111)
         
@@ -935,9 +931,10 @@ class multilc(lc):
         # TESS ID and data:
         if (overwrite or self.all_ids['tess']=={}) and ('all' in search or 'tess' in search):
             tess_id = Catalogs.query_criteria(coordinates=self.radec.transform_to(FK5(equinox='J2000.0')),radius=12*u.arcsec,catalog="TIC",
-                                                objType="STAR",columns=['ID','KIC','Tmag']).to_pandas()
+                                                objType="STAR",columns=['ID','KIC','Tmag'])
             if tess_id is not None and len(tess_id)>0:
-                tess_id=tess_id.iloc[np.argmin(tess_id['Tmag'])] if type(tess_id)==pd.DataFrame else tess_id
+                #Picking the brightest match (ignoring missing Tmags) on the astropy table and only converting that row to pandas:
+                tess_id=tess_id[[tools.brightest_ix(tess_id['Tmag'])]].to_pandas().iloc[0]
                 self.all_ids['tess']={'id':tess_id['ID']}
                 self.all_ids['tess']['data']=tess_id
             
@@ -1671,8 +1668,8 @@ class multilc(lc):
                                             f[1]['LightCurve']['AperturePhotometry']['Aperture_003']['X'][:])),
                          cent_2=np.hstack((f[0]['LightCurve']['AperturePhotometry']['Aperture_003']['Y'][:],
                                             f[1]['LightCurve']['AperturePhotometry']['Aperture_003']['Y'][:])),
-                         quality=np.array([np.power(2,15) if c=='G' else 0.0 for c in np.hstack((f[0]['LightCurve']['AperturePhotometry']['Aperture_003']['QualityFlag'][:],
-                                                                f[1]['LightCurve']['AperturePhotometry']['Aperture_003']['QualityFlag'][:]))]).astype(int))
+                         quality=tools.qlp_quality(np.hstack((f[0]['LightCurve']['AperturePhotometry']['Aperture_003']['QualityFlag'][:],
+                                                                f[1]['LightCurve']['AperturePhotometry']['Aperture_003']['QualityFlag'][:]))))
             return ilc
         elif type(f)==h5py._hl.files.File:
             #QLP is defined in mags, so lets
@@ -1694,7 +1691,7 @@ class multilc(lc):
                          src='qlpfts',mission='tess', jd_base=2457000, flx_system='norm1', sect=sect,
                          cent_1=f['LightCurve']['AperturePhotometry']['Aperture_003']['X'][:],
                          cent_2=f['LightCurve']['AperturePhotometry']['Aperture_003']['Y'][:],
-                         quality=np.array([np.power(2,15) if c=='G' else 0.0 for c in f['LightCurve']['AperturePhotometry']['Aperture_003']['QualityFlag'][:]]).astype(int))
+                         quality=tools.qlp_quality(f['LightCurve']['AperturePhotometry']['Aperture_003']['QualityFlag'][:]))
             return ilc
         # elif type(f)==eleanor.TargetData:
         #     # Eleanor TESS object
@@ -1867,6 +1864,7 @@ class multilc(lc):
         elif hasattr(self,'init_plot_info'):
             assert 'fine_cuts' in self.init_plot_info and 'ordered_cadences' in self.init_plot_info
 
+        import matplotlib.pyplot as plt
         fig=plt.figure(figsize=(11.69,8.27)) #A4 page: 8.27 x 11.69
         gs = fig.add_gridspec(self.init_plot_info['plot_rows'],24,wspace=0.07,hspace=0.18)
         subplots={}
@@ -1999,6 +1997,8 @@ class multilc(lc):
         from bokeh.plotting import figure, output_file, save, show
         from bokeh.models import Range1d
         from bokeh.layouts import layout, row
+        import matplotlib
+        import matplotlib.pyplot as plt
 
         fig = figure(title=tools.id_dic[self.mission]+str(id).zfill(11), width=plot_width, height=plot_height)
         if saveloc is None:
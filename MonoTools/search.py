@@ -18,7 +18,14 @@ from copy import deepcopy
 from datetime import datetime
 
 from scipy import optimize
-import exoplanet as xo
+try:
+    import exoplanet as xo
+    import theano.tensor as tt
+    import pymc3 as pm
+    import pymc3_ext as pmx
+    import theano
+except ImportError as err:
+    raise ImportError("MonoTools.search needs the modelling dependencies. Install them with `pip install MonoTools[model]`") from err
 import scipy.interpolate as interp
 import scipy.optimize as optim
 import matplotlib.pyplot as plt
@@ -32,12 +39,15 @@ from astroquery.vizier import Vizier
 from astroquery.mast import Catalogs
 from astropy.io import fits
 
-import seaborn as sns
 import logging
 logging.getLogger('matplotlib').disabled = True
 logging.getLogger('matplotlib').disabled = True
 
 
+#Constants of the sinusoidal "wavelet" model used as a transit-vs-variability comparison in search_monos:
+_TWO_PI_SQ = 2*np.pi**2
+_HALF_PI = 0.5*np.pi
+
 MonoData_tablepath = os.path.join(os.path.dirname(__file__),'data','tables')
 if os.environ.get('MONOTOOLSPATH') is None:
     MonoData_savepath = os.path.join('/'.join(os.path.dirname( __file__ ).split('/')[:-1]),'data')
@@ -67,10 +77,6 @@ for key in theano_pars:
     if key not in os.environ["THEANO_FLAGS"]:
         os.environ["THEANO_FLAGS"] = os.environ["THEANO_FLAGS"]+','+key+"="+theano_pars[key]
 
-import theano.tensor as tt
-import pymc3 as pm
-import pymc3_ext as pmx
-import theano
 theano.config.print_test_value = True
 theano.config.exception_verbosity='high'
 
@@ -79,6 +85,44 @@ from . import fit
 from . import lightcurve
 from . import starpars
 
+
+#The transit template, sinusoid template and sum(log(sigma2)) do not depend on the fitted parameters,
+# so target.search_monos computes them once per search position and passes them in, leaving only the amplitude(s) to vary.
+def trans_model_neglnlik(params,y,sigma2,lnsigma2,trans_template):
+    #Returns chi-squared for transit model
+    # pars = log_depth
+    model=np.exp(params[0])*trans_template
+    return 0.5 * (np.sum((y - model)**2 / sigma2) + lnsigma2)
+
+def sin_model_neglnlik(params,y,sigma2,lnsigma2,sin_template):
+    #Returns chi-squared for sinusoidal model
+    # pars = depth
+    model=params[0]*sin_template
+    return 0.5 * (np.sum((y - model)**2 / sigma2) + lnsigma2)
+
+def trans_model_poly_neglnlik(params,x,y,sigma2,lnsigma2,trans_template):
+    #Returns chi-squared for transit model, plus linear background flux trend
+    # pars = log_depth, gradient
+    model=x*params[1]+np.exp(params[0])*trans_template
+    return 0.5 * (np.sum((y - model)**2 / sigma2) + lnsigma2)
+
+def sin_model_poly_neglnlik(params,x,y,sigma2,lnsigma2,sin_template):
+    #Returns chi-squared for sinusoidal model, plus linear background flux trend
+    # pars = log_depth, gradient
+    model=x*params[1]+np.exp(params[0])*sin_template
+    return 0.5 * (np.sum((y - model)**2 / sigma2) + lnsigma2)
+
+def amp_model_fit(neglnlik,y,sigma2,lnsigma2,template,log_amp=False):
+    #Without a gradient term, both models are linear in their amplitude, so the weighted least-squares
+    # solution is found directly rather than through optim.minimize.
+    # For the (log-)depth of the transit model the amplitude is kept positive.
+    w_template=template/sigma2
+    denom=np.sum(template*w_template)
+    amp=np.sum(y*w_template)/denom if denom>0 else 0.0
+    x=np.array([np.log(np.clip(amp,0.00000001,1000))]) if log_amp else np.array([amp])
+    return optim.OptimizeResult(x=x,fun=neglnlik(x,y,sigma2,lnsigma2,template),success=True)
+
+
 class target():
     """The core target class which represents an individual star
     """
@@ -302,36 +346,9 @@ class target():
         print(str(self.id)+" - Searching "+str(np.sum([len(xr) for xr in search_xranges]))+" positions with "+str(n_durs)+" durations:",','.join(list(np.round(self.mono_search_tdurs,3).astype(str))))
 
         #Looping through search and computing chi-sq at each position:
-        self.mono_search_timeseries=pd.DataFrame()
+        # (rows are collected in a list and turned into a DataFrame once, rather than re-copying the table with .append at every step)
+        search_rows=[]
 
-        def trans_model_neglnlik(params,x,y,sigma2,init_log_dep,interpmodel):
-            #Returns chi-squared for transit model, plus linear background flux trend
-            # pars = depth, duration, poly1, poly2
-            model=np.exp(params[0]-init_log_dep)*interpmodel(x)
-            return 0.5 * np.sum((y - model)**2 / sigma2 + np.log(sigma2))
-        
-        def sin_model_neglnlik(params,x,y,sigma2,tcen,dur):
-            #Returns chi-squared for transit model, plus linear background flux trend
-            # pars = depth, duration, poly1, poly2
-            newt=x/(2.6*dur)*2*np.pi
-            amp=np.exp(-1*np.power(newt, 2.) / (2 * np.power(np.pi, 2.)))
-            model=params[0]*(amp*np.sin(newt-np.pi*0.5)-0.1)
-            return 0.5 * np.sum((y - model)**2 / sigma2 + np.log(sigma2))
-        
-        def trans_model_poly_neglnlik(params,x,y,sigma2,init_log_dep,interpmodel):
-            #Returns chi-squared for transit model, plus linear background flux trend
-            # pars = depth, gradient
-            model=x*params[1]+np.exp(params[0]-init_log_dep)*interpmodel(x)
-            return 0.5 * np.sum((y - model)**2 / sigma2 + np.log(sigma2))
-        
-        def sin_model_poly_neglnlik(params,x,y,sigma2,tcen,dur):
-            #Returns chi-squared for transit model, plus linear background flux trend
-            # pars = log_depth, poly1, poly2
-            newt=x/(2*dur)*2*np.pi
-            amp=np.exp(-1*np.power(newt, 2.) / (2 * np.power(np.pi, 2.)))
-            model=x*params[1]+np.exp(params[0])*(amp*np.sin(newt-np.pi*0.5)-0.1)
-            return 0.5 * np.sum((y - model)**2 / sigma2 + np.log(sigma2))
-        
         #from progress.bar import IncrementalBar
         #bar = IncrementalBar('Searching for monotransit', max = np.sum([len(xr) for xr in search_xranges]))
 
@@ -364,8 +381,10 @@ class target():
             #Making depth vary from 0.1 to 1.0
             init_dep_shifts=np.exp(np.random.normal(0.0,n_oversamp*0.01,len(search_xrange)))
             randns=np.random.randint(2,size=(len(search_xrange),2))
-            cad=np.nanmedian(np.diff(uselc[:,0]))
-            p_transit = np.clip(3/(len(uselc[:,0])*cad),0.0,0.05)
+            #Splitting the lightcurve into contiguous 1D columns once per duration, rather than slicing strided columns at every position:
+            use_t,use_f,use_e=[np.ascontiguousarray(uselc[:,i]) for i in range(3)]
+            cad=np.nanmedian(np.diff(use_t))
+            p_transit = np.clip(3/(len(use_t)*cad),0.0,0.05)
             
             #What is the probability of transit given duration (used in the prior calculation) - duration
             methods=['SLSQP','Nelder-Mead','Powell']
@@ -374,41 +393,41 @@ class target():
             for n_mod,x2s in enumerate(search_xrange):
                 #bar.next()
                 #minimise single params - depth
-                round_tr=abs(uselc[:,0]-x2s)<(transit_zoom*tdur)
+                round_tr=abs(use_t-x2s)<(transit_zoom*tdur)
                 #Centering x array on epoch to search
-                x=uselc[round_tr,0]-x2s
+                x=use_t[round_tr]-x2s
                 in_tr=abs(x)<(0.45*tdur)
                 if len(x[in_tr])>0 and not np.isnan(x[in_tr]).all() and len(x[~in_tr])>0 and not np.isnan(x[~in_tr]).all():
-                    y=uselc[round_tr,1]
+                    y=use_f[round_tr]
                     oot_median=np.nanmedian(y[~in_tr])
                     y-=oot_median
-                    yerr=uselc[round_tr,2]
+                    yerr=use_e[round_tr]
                     sigma2=yerr**2
                     init_log_dep=np.log(np.clip(-1*(np.nanmedian(y[in_tr]))*init_dep_shifts[n_mod],0.00000001,1000))
                     init_noise=np.std(y)
                     
                     #print(x,y,poly_order)
+                    lnsigma2=np.sum(np.log(sigma2))
                     poly_fit=np.polyfit(x,y,poly_order)
-                    poly_neg_llik=0.5 * np.sum((y - np.polyval(poly_fit,x))**2 / sigma2 + np.log(sigma2))
+                    poly_neg_llik=0.5 * (np.sum((y - np.polyval(poly_fit,x))**2 / sigma2) + lnsigma2)
+
+                    trans_template=np.exp(-logmodeldep)*self.mono_search_interpmodels[n%n_durs](x)
+                    #Sinusoid "wavelet" of a similar width to the transit (slightly wider when not co-fitting a gradient):
+                    newt=x*(np.pi/tdur) if use_poly else x*(np.pi/(1.3*tdur))
+                    sin_template=np.exp(-newt*newt/_TWO_PI_SQ)*np.sin(newt-_HALF_PI)-0.1
 
                     if use_poly:
                         init_grad=np.polyfit(x[~in_tr],y[~in_tr],1)[0]
                         res_trans=optim.minimize(trans_model_poly_neglnlik,np.hstack((init_log_dep,init_grad)),
-                                                args=(x,y,sigma2,
-                                                    logmodeldep,self.mono_search_interpmodels[n%n_durs]),
+                                                args=(x,y,sigma2,lnsigma2,trans_template),
                                                 method = methods[randns[n_mod,0]])
                         res_sin=optim.minimize(sin_model_poly_neglnlik, 
                                             np.hstack((init_log_dep,init_grad)),
-                                            args=(x,y,sigma2,x2s,tdur),
+                                            args=(x,y,sigma2,lnsigma2,sin_template),
                                             method = methods[randns[n_mod,1]])
                     else:
-                        res_trans=optim.minimize(trans_model_neglnlik,(init_log_dep),
-                                                args=(x,y,sigma2,
-                                                    logmodeldep,self.mono_search_interpmodels[n%n_durs]),
-                                                method = methods[randns[n_mod,0]])
-                        res_sin=optim.minimize(sin_model_neglnlik, (init_log_dep),
-                                            args=(x,y,sigma2,x2s,tdur),
-                                            method = methods[randns[n_mod,1]])                
+                        res_trans=amp_model_fit(trans_model_neglnlik,y,sigma2,lnsigma2,trans_template,log_amp=True)
+                        res_sin=amp_model_fit(sin_model_neglnlik,y,sigma2,lnsigma2,sin_template)
                     log_len=np.log(np.sum(round_tr))
 
                     #BIC = log(n_points)*n_params - 2*(log_likelihood + log_prior)
@@ -442,9 +461,10 @@ class target():
                         #outdic.update({'trans_poly_'+str(n):res_trans.x[1+n] for n in range(poly_order)})
                         outdic['sin_grad']=res_sin.x[1]
                         #outdic.update({'sin_poly_'+str(n):res_sin.x[1+n] for n in range(poly_order)})
-                    self.mono_search_timeseries=self.mono_search_timeseries.append(pd.Series(outdic,name=len(self.mono_search_timeseries)))
+                    search_rows+=[outdic]
             #print(n,len(self.mono_search_timeseries))
         #bar.finish()
+        self.mono_search_timeseries=pd.DataFrame(search_rows)
         self.mono_search_timeseries=self.mono_search_timeseries.sort_values('tcen')
         #Transit model has to be better than the sin model AND the DeltaBIC w.r.t to the polynomial must be <-10.
         # transit depth must be <0.0,
@@ -743,12 +763,12 @@ class target():
                     trans_model=mono_dets['trans_grad']*x+(mono_dets['trans_dep']/modeldep)*self.mono_search_interpmodels[nmod](x)
 
                 #Plotting sin wavelet:
-                newt=x/(2*tdur)*2*np.pi
-                amp=np.exp(-1*np.power(newt*1.25, 2.) / (2 * np.power(np.pi, 2.)))
+                newt=x*(np.pi/tdur)
+                amp=np.exp(-1.5625*newt*newt/_TWO_PI_SQ)
                 if use_flat and not use_poly:
-                    sin_model=mono_dets['sin_dep']*(amp*np.sin(newt-np.pi*0.5)-0.1)
+                    sin_model=mono_dets['sin_dep']*(amp*np.sin(newt-_HALF_PI)-0.1)
                 else:
-                    sin_model=mono_dets['sin_grad']*x+mono_dets['sin_dep']*(amp*np.sin(newt-np.pi*0.5)-0.1)
+                    sin_model=mono_dets['sin_grad']*x+mono_dets['sin_dep']*(amp*np.sin(newt-_HALF_PI)-0.1)
 
                 if nm==0:
                     axes['m_'+monopl+'a'].set_ylabel("flux ["+self.lc.flx_system+"]")
@@ -1047,6 +1067,7 @@ class target():
             plot_loc (str, optional): Location at which to save. Defaults to a file in `self.dataloc`
             plot_extent (float, optional): Extent in time of zoom plots in days. Defaults to 0.8.
         """
+        import seaborn as sns
         sns.set_palette("viridis",10)
         fig = plt.figure(figsize=(11.69,8.27))
         nplots=len(self.multis)*24
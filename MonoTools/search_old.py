@@ -786,7 +786,7 @@ def PlotMonoSearch(lc, ID, monosearchparams, mono_dic, interpmodels, tdurs,
     def gaussian(x , s):
         #Simple gaussian given position-adjusted x and sigma in order to convolve chisq spectrum
         return 1./np.sqrt( 2. * np.pi * s**2 ) * np.exp( -x**2 / ( 2. * s**2 ) )
-    chisqs_conv=np.convolve(chisqs, np.fromiter( (gaussian(x, n_oversamp*0.5) for x in range(-1*n_oversamp, n_oversamp, 1 ) ), np.float ), mode='same' )
+    chisqs_conv=np.convolve(chisqs, np.fromiter( (gaussian(x, n_oversamp*0.5) for x in range(-1*n_oversamp, n_oversamp, 1 ) ), np.float64 ), mode='same' )
     
     #Finding all points below some threshold:
     rms_chisq=np.std(chisqs_conv[chisqs_conv>np.percentile(chisqs_conv,20)])
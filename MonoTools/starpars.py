@@ -25,17 +25,10 @@ from copy import deepcopy
 
 from astropy.io import fits
 try: # Python 3.x
-    from urllib.parse import quote as urlencode
     from urllib.request import urlretrieve
 except ImportError:  # Python 2.x
-    from urllib import pathname2url as urlencode
     from urllib import urlretrieve
 
-try: # Python 3.x
-    import http.client as httplib
-except ImportError:  # Python 2.x
-    import httplib
-
 from astropy.table import Table
 from astropy.io import ascii
 
@@ -54,6 +47,9 @@ else:
     ssl._create_default_https_context = _create_unverified_https_context
 
 
+#A single session keeps the TCP/TLS connection to MAST alive across queries (and across status polls)
+mast_session=requests.Session()
+
 def mastQuery(request):
     """Perform a MAST query.
 
@@ -63,8 +59,6 @@ def mastQuery(request):
 
         Returns head,content where head is the response HTTP headers, and content is the returned data"""
 
-    server='mast.stsci.edu'
-
     # Grab Python Version
     version = ".".join(map(str, sys.version_info[:3]))
 
@@ -75,21 +69,13 @@ def mastQuery(request):
 
     # Encoding the request as a json string
     requestString = json.dumps(request)
-    requestString = urlencode(requestString)
 
-    # opening the https connection
-    conn = httplib.HTTPSConnection(server)
-
-    # Making the query
-    conn.request("POST", "/api/v0/invoke", "request="+requestString, headers)
+    # Making the query over the persistent session (with a timeout so a stalled keep-alive connection can't hang the status polling)
+    resp = mast_session.post("https://mast.stsci.edu/api/v0/invoke", data={"request":requestString}, headers=headers, timeout=120)
 
     # Getting the response
-    resp = conn.getresponse()
-    head = resp.getheaders()
-    content = resp.read().decode('utf-8')
-
-    # Close the https connection
-    conn.close()
+    head = list(resp.headers.items())
+    content = resp.content.decode('utf-8')
 
     return head,content
 
@@ -99,24 +85,24 @@ def TICdata(tics,sect=None,getImageData=False):
     Download TESS stellar data
 
     Arguments:
-        tics -- list of TESS IDs
+        tics -- TESS ID or list of TESS IDs (all IDs are fetched in a single MAST query)
 
     Returns:
         pandas DataFrame of stellar info from TIC.
     """
-    if type(tics)==int or type(tics)==str:
-        tics=np.array([tics])
-    elif type(tics)==float:
-        tics=np.array([int(tics)])
+    tics=np.atleast_1d(tics)
+    if tics.dtype.kind=='f':
+        #Float IDs (e.g. from a pandas column) would otherwise be sent as "12345.0"
+        tics=tics.astype(np.int64)
     ticStringList=tics.astype(str)
     allData=[]
 
     #cols=['objID','objType','MH','logg','Teff','rho','rad','mass','ra','dec','pmRA','pmDEC','Tmag','contratio','d','gallat','gallong']
-    tess_df=pd.DataFrame()
 
     request= {'service':'Mast.Catalogs.Filtered.Tic',
          'params':{'columns':'*', 'filters':[{'paramName':'ID', 'values':list(ticStringList)}]},
          'format':'json', 'removenullcolumns':True}
+    startTime = time.time()
     while True:
         headers, outString = mastQuery(request)
         outObject = json.loads(outString)
@@ -128,27 +114,32 @@ def TICdata(tics,sect=None,getImageData=False):
             print("Working...")
             startTime = time.time()
         time.sleep(5)
-    for ni in range(len(outObject['data'])):
-        tess_df=tess_df.append(pd.Series({col:outObject['data'][ni][col] for col in outObject['data'][ni]},name=int(outObject['data'][ni]['ID'])))
+    #Building the table in one go from all returned rows, indexed by (integer) TIC ID:
+    tess_df=pd.DataFrame(outObject['data'])
+    if len(tess_df)>0:
+        tess_df.index=tess_df['ID'].values.astype(int)
 
-    if getImageData and sect is not None:
+    if getImageData and sect is not None and len(tess_df)>0:
         tess_df['sector']=np.tile(np.nan,len(tess_df))
         tess_df['camera']=np.tile(np.nan,len(tess_df))
         tess_df['CCD']=np.tile(np.nan,len(tess_df))
         tess_df['colPix']=np.tile(np.nan,len(tess_df))
         tess_df['rowPix']=np.tile(np.nan,len(tess_df))
-        for n,row in tess_df.iterrows():
-            out = tess_stars2px_function_entry(int(row['ID']), tess_df['ra'], tess_df['dec'])
-            outID, outEclipLong, outEclipLat, outSec, outCam, outCcd, outColPix, outRowPix, scinfo = out
-            try:
-                sectloc=list(outSec).index(sect)
-                tess_df.loc[int(row['ID']),'sector']=outSec[sectloc]
-                tess_df.loc[int(row['ID']),'camera']=outCam[sectloc]
-                tess_df.loc[int(row['ID']),'CCD']=outCcd[sectloc]
-                tess_df.loc[int(row['ID']),'colPix']=outColPix[sectloc]
-                tess_df.loc[int(row['ID']),'rowPix']=outRowPix[sectloc]
-            except:
-                print(sect," not in observed sectors, ",outSec)
+        from tess_stars2px import tess_stars2px_function_entry
+        #Projecting all stars in one call (restricted to the requested sector) rather than once per row:
+        out = tess_stars2px_function_entry(tess_df.index.values.astype(int), tess_df['ra'].values.astype(float),
+                                           tess_df['dec'].values.astype(float), trySector=sect)
+        outID, outEclipLong, outEclipLat, outSec, outCam, outCcd, outColPix, outRowPix, scinfo = out
+        in_sect=np.where((outSec==sect)&np.isin(outID,tess_df.index.values))[0]
+        #Taking the first on-silicon hit for each star:
+        hits=in_sect[np.unique(outID[in_sect],return_index=True)[1]]
+        tess_df.loc[outID[hits],'sector']=outSec[hits]
+        tess_df.loc[outID[hits],'camera']=outCam[hits]
+        tess_df.loc[outID[hits],'CCD']=outCcd[hits]
+        tess_df.loc[outID[hits],'colPix']=outColPix[hits]
+        tess_df.loc[outID[hits],'rowPix']=outRowPix[hits]
+        if len(hits)<len(tess_df):
+            print(sect," not in observed sectors for ",list(tess_df.index.values[~np.isin(tess_df.index.values,outID[hits])]))
 
     return tess_df
 
@@ -179,13 +170,10 @@ def QueryGaiaAndSurveys(sc,CONESIZE=15*u.arcsec,savefile=None,mission='tess',loo
         APASS=None
     #pd.DataFrame.from_csv("https://www.aavso.org/cgi-bin/apass_dr10_download.pl?ra="+str(SC.ra.deg)+"&dec="+str(SC.dec.deg)+"&radius="+str(CONESIZE/3600)+"&output=csv")
 
-    alldat=pd.DataFrame()
-
     if loop_gaia:
-        #Looping through Gaia results to find best match
-        for n,index in enumerate(gaia_res.index.values):
-            alldat=alldat.append(QueryCats(str(list(np.sort(closeness)).index(closeness[n])),
-                                           gaia_res.loc[index],mission,APASS))
+        #Looping through Gaia results to find best match (building the DataFrame once from all the rows)
+        alldat=pd.DataFrame([QueryCats(str(list(np.sort(closeness)).index(closeness[n])),
+                                       gaia_res.loc[index],mission,APASS) for n,index in enumerate(gaia_res.index.values)])
     else:
         ser=gaia_res.iloc[np.nanargmin(closeness.values)]
         alldat=QueryCats("0",ser,mission,APASS)
@@ -0,0 +1,63 @@
+from MonoTools import search
+import scipy.optimize as optim
+
+import numpy as np
+np.random.seed(1812)
+
+import unittest
+
+class TestAmpModelFit(unittest.TestCase):
+
+    def setUp(self):
+        #A 0.2d transit-like dip (normalised to -1 at the centre, as in search_monos) plus a sinusoid "wavelet" template
+        self.x = np.linspace(-0.45,0.45,180)
+        tdur = 0.2
+        self.trans_template = -1*np.clip((0.5*tdur-abs(self.x))/(0.15*tdur),0.0,1.0)
+        newt = self.x*(np.pi/(1.3*tdur))
+        self.sin_template = np.exp(-newt*newt/search._TWO_PI_SQ)*np.sin(newt-search._HALF_PI)-0.1
+        self.noise = 0.0008
+        self.sigma2 = np.tile(self.noise**2,len(self.x))
+        self.lnsigma2 = np.sum(np.log(self.sigma2))
+
+    def fit_both(self, y, template, neglnlik, log_amp, init):
+        closed = search.amp_model_fit(neglnlik,y,self.sigma2,self.lnsigma2,template,log_amp=log_amp)
+        brute = optim.minimize(neglnlik,np.array([init]),args=(y,self.sigma2,self.lnsigma2,template),
+                               method='Nelder-Mead',options={'xatol':1e-10,'fatol':1e-10,'maxiter':5000})
+        return closed, brute
+
+    def test_positive_depth(self):
+        y = 0.003*self.trans_template + np.random.normal(0.0,self.noise,len(self.x))
+        closed, brute = self.fit_both(y, self.trans_template, search.trans_model_neglnlik, True, np.log(0.001))
+        self.assertAlmostEqual(closed.x[0], brute.x[0], places=4)
+        self.assertAlmostEqual(closed.fun, brute.fun, places=5)
+
+        closed, brute = self.fit_both(y, self.sin_template, search.sin_model_neglnlik, False, 0.001)
+        self.assertAlmostEqual(closed.x[0], brute.x[0], places=6)
+        self.assertAlmostEqual(closed.fun, brute.fun, places=5)
+
+    def test_negative_optimum(self):
+        #A bump rather than a dip - the best positive depth is as small as possible, so it gets clipped to 1e-8
+        # (which only costs a negligible amount of likelihood compared to letting the log-depth run off to -inf)
+        y = -0.003*self.trans_template + np.random.normal(0.0,self.noise,len(self.x))
+        closed, brute = self.fit_both(y, self.trans_template, search.trans_model_neglnlik, True, np.log(0.001))
+        self.assertAlmostEqual(closed.x[0], np.log(0.00000001))
+        self.assertLess(brute.x[0], np.log(0.00001))
+        self.assertAlmostEqual(closed.fun, brute.fun, places=2)
+
+    def test_zero_template(self):
+        #With no template (denom<=0) the model is flat whatever the amplitude, so both fits give the null likelihood
+        y = np.random.normal(0.0,self.noise,len(self.x))
+        zeros = np.zeros_like(self.x)
+        null_fun = 0.5 * (np.sum(y**2 / self.sigma2) + self.lnsigma2)
+        closed, brute = self.fit_both(y, zeros, search.trans_model_neglnlik, True, np.log(0.001))
+        self.assertAlmostEqual(closed.x[0], np.log(0.00000001))
+        self.assertAlmostEqual(closed.fun, brute.fun)
+        self.assertAlmostEqual(closed.fun, null_fun)
+
+        closed, brute = self.fit_both(y, zeros, search.sin_model_neglnlik, False, 0.001)
+        self.assertEqual(closed.x[0], 0.0)
+        self.assertAlmostEqual(closed.fun, brute.fun)
+        self.assertAlmostEqual(closed.fun, null_fun)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,6 @@ import warnings
 warnings.filterwarnings("ignore")
 
 import numpy as np
-import exoplanet as xo
-
-import numpy as np
-import matplotlib.pyplot as plt
 import pandas as pd
 
 from astropy.io import fits
@@ -15,8 +11,6 @@ from scipy.interpolate import LSQUnivariateSpline, BSpline,splev,splrep
 
 import h5py
 
-import pymc3 as pm
-import theano.tensor as tt
 import astropy.units as u
 from astropy.units import cds
 from astropy import constants as c
@@ -35,6 +29,7 @@ import requests
 import httplib2
 from lxml import html
 import importlib
+import functools
 import tess_stars2px
 import glob
 
@@ -53,6 +48,12 @@ lc_dic={'tess':'ts','kepler':'k1','k2':'k2','corot':'co','cheops':'ch'}
 
 #goto='/Users/hosborn' if 'Users' in os.path.dirname(os.path.realpath(__file__)).split('/') else '/home/hosborn'
 
+def qlp_quality(flags):
+    #Converts QLP "QualityFlag" arrays into integer quality bits (2^15 where flagged 'G', else 0)
+    # Comparing as an object array keeps the elementwise python == semantics (e.g. bytes never match 'G')
+    # while selecting with a single mask rather than branching per cadence.
+    return np.where(np.asarray(flags,dtype=object)=='G',np.power(2,15),0).astype(int)
+
 def openFits(f,fname,mission,cut_all_anom_lim=4.0,use_ppt=True,force_raw_flux=False,end_of_orbit=False,mask=None,**kwargs):
     """opens and processes all lightcurve files (especially, but not only, fits files).
 
@@ -175,7 +176,7 @@ def openFits(f,fname,mission,cut_all_anom_lim=4.0,use_ppt=True,force_raw_flux=Fa
             'bg_flux':f['LightCurve']['Background']['Value'][:],
             'cent_1':f['LightCurve']['AperturePhotometry']['Aperture_003']['X'][:],
             'cent_2':f['LightCurve']['AperturePhotometry']['Aperture_003']['Y'][:],
-            'quality':np.array([np.power(2,15) if c=='G' else 0.0 for c in f['LightCurve']['AperturePhotometry']['Aperture_003']['QualityFlag'][:]]).astype(int),
+            'quality':qlp_quality(f['LightCurve']['AperturePhotometry']['Aperture_003']['QualityFlag'][:]),
             'flux_sm_ap':mag2flux(f['LightCurve']['AperturePhotometry']['Aperture_000']['KSPMagnitude'][:]),
             'flux_xl_ap':mag2flux(f['LightCurve']['AperturePhotometry']['Aperture_004']['KSPMagnitude'][:])}
         #    'flux_err':magerr2flux(f['LightCurve']['AperturePhotometry']['Aperture_002']['RawMagnitudeError'][:],
@@ -591,6 +592,25 @@ def K2_lc(epic,coor=None,pers=None,durs=None,t0s=None, use_ppt=True):
         return None,df
 
 
+#Kepler quarter timestamps (and long/short cadence) used to build MAST lightcurve urls:
+kepler_qcodes=["2009131105131_llc","2009131110544_slc","2009166043257_llc","2009166044711_slc","2009201121230_slc",
+               "2009231120729_slc","2009259160929_llc","2009259162342_slc","2009291181958_slc","2009322144938_slc",
+               "2009350155506_llc","2009350160919_slc","2010019161129_slc","2010049094358_slc","2010078095331_llc",
+               "2010078100744_slc","2010111051353_slc","2010140023957_slc","2010174085026_llc","2010174090439_slc",
+               "2010203174610_slc","2010234115140_slc","2010265121752_llc","2010265121752_slc","2010296114515_slc",
+               "2010326094124_slc","2010355172524_llc","2010355172524_slc","2011024051157_slc","2011053090032_slc",
+               "2011073133259_llc","2011073133259_slc","2011116030358_slc","2011145075126_slc","2011177032512_llc",
+               "2011177032512_slc","2011208035123_slc","2011240104155_slc","2011271113734_llc","2011271113734_slc",
+               "2011303113607_slc","2011334093404_slc","2012004120508_llc","2012004120508_slc","2012032013838_slc",
+               "2012060035710_slc","2012088054726_llc","2012088054726_slc","2012121044856_slc","2012151031540_slc",
+               "2012179063303_llc","2012179063303_slc","2012211050319_slc","2012242122129_slc","2012277125453_llc",
+               "2012277125453_slc","2012310112549_slc","2012341132017_slc","2013011073258_llc","2013011073258_slc",
+               "2013017113907_slc","2013065031647_slc","2013098041711_llc","2013098041711_slc","2013121191144_slc",
+               "2013131215648_llc"]
+#qcodes=[2009131105131,2009166043257,2009259160929,2009350155506,2010009091648,2010078095331,2010174085026,
+#        2010265121752,2010355172524,2011073133259,2011177032512,2011271113734,2012004120508,2012088054726,
+#        2012179063303,2012277125453,2013011073258,2013098041711,2013131215648]
+
 def getKeplerLC(kic,cadence='long',use_ppt=True,**kwargs):
     '''
     This module uses the KIC of a planet candidate to download lightcurves
@@ -601,26 +621,9 @@ def getKeplerLC(kic,cadence='long',use_ppt=True,**kwargs):
     Returns:
         lightcurve
     '''
-    qcodes=["2009131105131_llc","2009131110544_slc","2009166043257_llc","2009166044711_slc","2009201121230_slc",
-            "2009231120729_slc","2009259160929_llc","2009259162342_slc","2009291181958_slc","2009322144938_slc",
-            "2009350155506_llc","2009350160919_slc","2010019161129_slc","2010049094358_slc","2010078095331_llc",
-            "2010078100744_slc","2010111051353_slc","2010140023957_slc","2010174085026_llc","2010174090439_slc",
-            "2010203174610_slc","2010234115140_slc","2010265121752_llc","2010265121752_slc","2010296114515_slc",
-            "2010326094124_slc","2010355172524_llc","2010355172524_slc","2011024051157_slc","2011053090032_slc",
-            "2011073133259_llc","2011073133259_slc","2011116030358_slc","2011145075126_slc","2011177032512_llc",
-            "2011177032512_slc","2011208035123_slc","2011240104155_slc","2011271113734_llc","2011271113734_slc",
-            "2011303113607_slc","2011334093404_slc","2012004120508_llc","2012004120508_slc","2012032013838_slc",
-            "2012060035710_slc","2012088054726_llc","2012088054726_slc","2012121044856_slc","2012151031540_slc",
-            "2012179063303_llc","2012179063303_slc","2012211050319_slc","2012242122129_slc","2012277125453_llc",
-            "2012277125453_slc","2012310112549_slc","2012341132017_slc","2013011073258_llc","2013011073258_slc",
-            "2013017113907_slc","2013065031647_slc","2013098041711_llc","2013098041711_slc","2013121191144_slc",
-            "2013131215648_llc"]
-    #qcodes=[2009131105131,2009166043257,2009259160929,2009350155506,2010009091648,2010078095331,2010174085026,
-    #        2010265121752,2010355172524,2011073133259,2011177032512,2011271113734,2012004120508,2012088054726,
-    #        2012179063303,2012277125453,2013011073258,2013098041711,2013131215648]
     lcs=[]
     if cadence=='long':
-        for q in [qc for qc in qcodes if qc[-4:]=='_llc']:
+        for q in [qc for qc in kepler_qcodes if qc[-4:]=='_llc']:
             lcloc='http://archive.stsci.edu/pub/kepler/lightcurves/'+str(int(kic)).zfill(9)[0:4]+'/'+str(int(kic)).zfill(9)+'/kplr'+str(int(kic)).zfill(9)+'-'+str(q)+'.fits'
             h = httplib2.Http()
             resp = h.request(lcloc, 'HEAD')
@@ -631,7 +634,7 @@ def getKeplerLC(kic,cadence='long',use_ppt=True,**kwargs):
                         lcs+=[ilc]
                     hdr=hdu[1].header
     elif cadence == 'short' and 'slc' in q:
-        for q in [qc for qc in qcodes if qc[-4:]=='_slc']:
+        for q in [qc for qc in kepler_qcodes if qc[-4:]=='_slc']:
             lcloc='http://archive.stsci.edu/pub/kepler/lightcurves/'+str(int(kic)).zfill(9)[0:4]+'/'+str(int(kic)).zfill(9)+'/kplr'+str(int(kic)).zfill(9)+'-'+str(q)+'.fits'
             h = httplib2.Http()
             resp = h.request(lcloc, 'HEAD')
@@ -758,60 +761,72 @@ def CutAnomDiff(flux,thresh=4.2):
                      abs(flux[-1]-np.median(flux[-3:-1]))<(np.median(abs(diffarr[0,:]))*thresh*5)))
     return anoms
 
+@functools.lru_cache(maxsize=None)
+def get_tess_scinfo():
+    # Building tess-point's spacecraft pointing model (per-sector camera pointings and focal plane models) is slow,
+    # but it is static, so we only build it once per session and re-use it for all subsequent sector look-ups.
+    return tess_stars2px.TESS_Spacecraft_Pointing_Data()
+
 def observed(tic,radec=None,maxsect=84):
     # Using either "webtess" page or Chris Burke's tesspoint to check if TESS object was observed:
     # Returns dictionary of each sector and whether it was observed or not
+    # radec can be a SkyCoord or (for callers which already have them) plain (ra, dec) floats in degrees,
+    # which skips the astropy coordinate machinery entirely.
     
     tess_stars2px = importlib.import_module("tess_stars2px")
     #from tesspoint import tess_stars2px_function_entry as tess_stars2px
-    result = tess_stars2px.tess_stars2px_function_entry(tic, radec.ra.deg, radec.dec.deg)
+    ra_deg,dec_deg = (radec.ra.deg, radec.dec.deg) if hasattr(radec,'ra') else (float(radec[0]), float(radec[1]))
+    result = tess_stars2px.tess_stars2px_function_entry(tic, ra_deg, dec_deg, scInfo=get_tess_scinfo())
     sectors = result[3]
-    out_dic={s:True if s in sectors else False for s in np.arange(maxsect)}
+    allsects=np.arange(maxsect)
+    out_dic=dict(zip(allsects,np.isin(allsects,sectors).tolist()))
     #print(out_dic)
     return out_dic
 
+#Locations of pre-computed CoRoT LCs (relative to the ETSS corot_exo FITSfiles directory):
+corot_lc_locs={102356770:["LRa03/EN2_STAR_MON_0102356770_20091003T223149_20100301T055642.fits"],
+               102387834:["LRa03/EN2_STAR_CHR_0102387834_20091003T223149_20100301T055610.fits"],
+               102574444:["LRa01/EN2_STAR_CHR_0102574444_20071023T223035_20080303T093534.fits"],
+               102582649:["LRa06/EN2_STAR_MON_0102582649_20120112T183055_20120329T092714.fits",
+                          "LRa01/EN2_STAR_CHR_0102582649_20071023T223035_20080303T093534.fits"],
+               102586624:["LRa06/EN2_STAR_MON_0102586624_20120112T183055_20120329T092714.fits",
+                          "LRa01/EN2_STAR_CHR_0102586624_20071023T223035_20080303T093534.fits"],
+               102647266:["LRa01/EN2_STAR_CHR_0102647266_20071023T223035_20080303T093534.fits"],
+               102709133:["LRa01/EN2_STAR_CHR_0102709133_20071023T223035_20080303T093502.fits"],
+               102723949:["LRa06/EN2_STAR_CHR_0102723949_20120112T183055_20120329T092714.fits",
+                          "LRa01/EN2_STAR_CHR_0102723949_20071023T223035_20080303T093502.fits",
+                          "IRa01/EN2_STAR_CHR_0102723949_20070203T130553_20070401T235518.fits"],
+               102765275:["LRa06/EN2_STAR_MON_0102765275_20120112T183055_20120329T092714.fits",
+                          "LRa01/EN2_STAR_CHR_0102765275_20071023T223035_20080303T093534.fits",
+                          "IRa01/EN2_STAR_MON_0102765275_20070203T130553_20070401T235518.fits"],
+               102801672:["IRa01/EN2_STAR_MON_0102801672_20070206T133547_20070401T235654.fits"],
+               102802996:["IRa01/EN2_STAR_MON_0102802996_20070206T133547_20070401T235654.fits"],
+               102822869:["IRa01/EN2_STAR_MON_0102822869_20070206T133547_20070401T235654.fits"],
+               102829388:["IRa01/EN2_STAR_MON_0102829388_20070206T133547_20070401T235654.fits"],
+               102855409:["IRa01/EN2_STAR_CHR_0102855409_20070206T133547_20070401T235654.fits"],
+               102868004:["IRa01/EN2_STAR_MON_0102868004_20070206T133547_20070401T235654.fits"],
+               102874481:["IRa01/EN2_STAR_CHR_0102874481_20070206T133547_20070401T235654.fits"],
+               102895957:["IRa01/EN2_STAR_CHR_0102895957_20070203T130553_20070401T235934.fits"],
+               102919036:["IRa01/EN2_STAR_MON_0102919036_20070203T130553_20070401T235518.fits"],
+               102973379:["IRa01/EN2_STAR_MON_0102973379_20070206T133547_20070401T235654.fits"],
+               211616889:["SRc01/EN2_STAR_MON_0211616889_20070413T180030_20070509T065744.fits"],
+               211621528:["SRc01/EN2_STAR_CHR_0211621528_20070413T180030_20070509T065744.fits"],
+               211631779:["SRc01/EN2_STAR_MON_0211631779_20070413T180206_20070509T065920.fits"],
+               211634383:["SRc01/EN2_STAR_MON_0211634383_20070413T180206_20070509T065920.fits"],
+               211647475:["SRc01/EN2_STAR_CHR_0211647475_20070413T180030_20070509T065744.fits"],
+               211649312:["SRc01/EN2_STAR_MON_0211649312_20070413T180030_20070509T065744.fits"],
+               211650063:["SRc01/EN2_STAR_MON_0211650063_20070413T180206_20070509T065920.fits"],
+               211666578:["SRc01/EN2_STAR_MON_0211666578_20070413T180030_20070509T065744.fits"],
+               310190466:["LRc03/EN2_STAR_MON_0310190466_20090403T220030_20090702T022725.fits"],
+               315188649:["SRa03/EN2_STAR_CHR_0315188649_20100305T001525_20100329T065610.fits"],
+               629951504:["LRc08/EN2_STAR_MON_0629951504_20110708T153829_20110930T045022.fits"]}
+
 def getCorotLC(corid,use_ppt=True,**kwargs):
     #These are pre-computed CoRoT LCs I have lying around. There is no easy API as far as I can tell.
     initstring="https://exoplanetarchive.ipac.caltech.edu/data/ETSS/corot_exo/FITSfiles/"
-    corotlclocs={102356770:["LRa03/EN2_STAR_MON_0102356770_20091003T223149_20100301T055642.fits"],
-                 102387834:["LRa03/EN2_STAR_CHR_0102387834_20091003T223149_20100301T055610.fits"],
-                 102574444:["LRa01/EN2_STAR_CHR_0102574444_20071023T223035_20080303T093534.fits"],
-                 102582649:["LRa06/EN2_STAR_MON_0102582649_20120112T183055_20120329T092714.fits",
-                            "LRa01/EN2_STAR_CHR_0102582649_20071023T223035_20080303T093534.fits"],
-                 102586624:["LRa06/EN2_STAR_MON_0102586624_20120112T183055_20120329T092714.fits",
-                            "LRa01/EN2_STAR_CHR_0102586624_20071023T223035_20080303T093534.fits"],
-                 102647266:["LRa01/EN2_STAR_CHR_0102647266_20071023T223035_20080303T093534.fits"],
-                 102709133:["LRa01/EN2_STAR_CHR_0102709133_20071023T223035_20080303T093502.fits"],
-                 102723949:["LRa06/EN2_STAR_CHR_0102723949_20120112T183055_20120329T092714.fits",
-                            "LRa01/EN2_STAR_CHR_0102723949_20071023T223035_20080303T093502.fits",
-                            "IRa01/EN2_STAR_CHR_0102723949_20070203T130553_20070401T235518.fits"],
-                 102765275:["LRa06/EN2_STAR_MON_0102765275_20120112T183055_20120329T092714.fits",
-                            "LRa01/EN2_STAR_CHR_0102765275_20071023T223035_20080303T093534.fits",
-                            "IRa01/EN2_STAR_MON_0102765275_20070203T130553_20070401T235518.fits"],
-                 102801672:["IRa01/EN2_STAR_MON_0102801672_20070206T133547_20070401T235654.fits"],
-                 102802996:["IRa01/EN2_STAR_MON_0102802996_20070206T133547_20070401T235654.fits"],
-                 102822869:["IRa01/EN2_STAR_MON_0102822869_20070206T133547_20070401T235654.fits"],
-                 102829388:["IRa01/EN2_STAR_MON_0102829388_20070206T133547_20070401T235654.fits"],
-                 102855409:["IRa01/EN2_STAR_CHR_0102855409_20070206T133547_20070401T235654.fits"],
-                 102868004:["IRa01/EN2_STAR_MON_0102868004_20070206T133547_20070401T235654.fits"],
-                 102874481:["IRa01/EN2_STAR_CHR_0102874481_20070206T133547_20070401T235654.fits"],
-                 102895957:["IRa01/EN2_STAR_CHR_0102895957_20070203T130553_20070401T235934.fits"],
-                 102919036:["IRa01/EN2_STAR_MON_0102919036_20070203T130553_20070401T235518.fits"],
-                 102973379:["IRa01/EN2_STAR_MON_0102973379_20070206T133547_20070401T235654.fits"],
-                 211616889:["SRc01/EN2_STAR_MON_0211616889_20070413T180030_20070509T065744.fits"],
-                 211621528:["SRc01/EN2_STAR_CHR_0211621528_20070413T180030_20070509T065744.fits"],
-                 211631779:["SRc01/EN2_STAR_MON_0211631779_20070413T180206_20070509T065920.fits"],
-                 211634383:["SRc01/EN2_STAR_MON_0211634383_20070413T180206_20070509T065920.fits"],
-                 211647475:["SRc01/EN2_STAR_CHR_0211647475_20070413T180030_20070509T065744.fits"],
-                 211649312:["SRc01/EN2_STAR_MON_0211649312_20070413T180030_20070509T065744.fits"],
-                 211650063:["SRc01/EN2_STAR_MON_0211650063_20070413T180206_20070509T065920.fits"],
-                 211666578:["SRc01/EN2_STAR_MON_0211666578_20070413T180030_20070509T065744.fits"],
-                 310190466:["LRc03/EN2_STAR_MON_0310190466_20090403T220030_20090702T022725.fits"],
-                 315188649:["SRa03/EN2_STAR_CHR_0315188649_20100305T001525_20100329T065610.fits"],
-                 629951504:["LRc08/EN2_STAR_MON_0629951504_20110708T153829_20110930T045022.fits"]}
-    if int(corid) in corotlclocs:
+    if int(corid) in corot_lc_locs:
         lcs=[]
-        for loc in corotlclocs[int(corid)]:
+        for loc in corot_lc_locs[int(corid)]:
             with fits.open(initstring+loc,show_progress=False,timeout=120) as hdus:
                 lci=openFits(hdus,initstring+loc,mission='corot',use_ppt=use_ppt,**kwargs)
                 lci['src']='corot'
@@ -1076,6 +1091,12 @@ def TESS_lc(tic, sectors='all',use_ppt=True, coords=None, use_qlp=None, use_elea
     else:
         return None,None
 
+def brightest_ix(mags):
+    #Index of the brightest entry in a (possibly masked) magnitude column, ignoring missing values.
+    #If every magnitude is missing we fall back to the first row rather than raising.
+    mags=np.ma.filled(np.ma.asarray(mags,dtype=float),np.nan)
+    return int(np.nanargmin(mags)) if np.any(np.isfinite(mags)) else 0
+
 def openLightCurve(ID,mission,coor=None,use_ppt=True,other_data=True,
                    jd_base=2457000,save=True,**kwargs):
     #from ..stellar import tess_stars2px_mod
@@ -1108,7 +1129,7 @@ def openLightCurve(ID,mission,coor=None,use_ppt=True,other_data=True,
 
 
             tess_id = Catalogs.query_criteria("TIC",coordinates=coor,radius=12*units.arcsec,
-                                              objType="STAR",columns=['ID','KIC','Tmag']).to_pandas()
+                                              objType="STAR",columns=['ID','KIC','Tmag'])
             #print(tess_id)
             #
             '''tess_id, tess_dat, sects = tess_stars2px_mod.SectFromCoords(coor,tic=None)
@@ -1116,8 +1137,8 @@ def openLightCurve(ID,mission,coor=None,use_ppt=True,other_data=True,
                 IDs['tess']=tess_id
             '''
             if tess_id is not None and len(tess_id)>0:
-                tess_id=tess_id.iloc[np.argmin(tess_id['Tmag'])] if type(tess_id)==pd.DataFrame else tess_id
-                IDs['tess']=tess_id['ID']
+                #Only the brightest match's ID is needed, so we pick it straight from the astropy table (no DataFrame needed)
+                IDs['tess']=tess_id['ID'][brightest_ix(tess_id['Tmag'])]
             else:
                 IDs['tess']=None
         #else:
@@ -1297,30 +1318,27 @@ def lcBin(lc,binsize=1/48,split_gap_size=0.8,use_flat=True,use_masked=True, use_
         mask=lc['mask']
     #For each of the seprated lightcurve blocks:
     for sh_time in loop_blocks:
-        nodata=False
-        #For each of the flux arrays (binned and normal):
+        #Selecting the segment indices once, and keeping time/err as contiguous 1D arrays shared by all flux keys:
+        seg_ix=sh_time[mask[sh_time]] if use_masked else sh_time
+        nodata=len(seg_ix)==0
         cads=None;digi=None
-        for fkey in flux_dic:
-            if use_masked:
-                if len(lc[fkey][sh_time][mask[sh_time]])>0:
-                    lc_segment=np.column_stack((lc['time'][sh_time][mask[sh_time]],
-                                                lc[fkey][sh_time][mask[sh_time]],
-                                                lc['flux_err'][sh_time][mask[sh_time]]))
-                    cads=lc['cadence'][sh_time][mask[sh_time]]
+        do_bin=binsize>(1.66*np.nanmedian(np.diff(lc['time'][sh_time])))
+        if not nodata:
+            seg_time=lc['time'][seg_ix]
+            seg_err=lc['flux_err'][seg_ix]
+            cads=lc['cadence'][seg_ix]
+            if do_bin:
+                digi=np.digitize(seg_time,np.arange(np.min(seg_time)-0.5*binsize,np.max(seg_time)+0.5*binsize,binsize))
+            #For each of the flux arrays (binned and normal):
+            for fkey in flux_dic:
+                if do_bin:
+                    #Only doing the binning if the cadence involved is >> the cadence
+                    binlc[fkey]+=[np.column_stack(bin_light_curve(time=seg_time,flux=lc[fkey][seg_ix],flux_err=seg_err,bin_time=binsize))]
                 else:
-                    nodata=True
-            else:
-                lc_segment=np.column_stack((lc['time'][sh_time],lc[fkey][sh_time],lc['flux_err'][sh_time]))
-                cads=lc['cadence'][sh_time]
-            if binsize>(1.66*np.nanmedian(np.diff(lc['time'][sh_time]))) and not nodata:
-                #Only doing the binning if the cadence involved is >> the cadence
-                binlc[fkey]+=[bin_lc_segment(lc_segment, binsize)]
-                digi=np.digitize(lc_segment[:,0],
-                                 np.arange(np.min(lc_segment[:,0])-0.5*binsize,np.max(lc_segment[:,0])+0.5*binsize,binsize))
-            elif not nodata:
-                binlc[fkey]+=[lc_segment]
-        if binsize>(1.66*np.nanmedian(np.diff(lc['time'][sh_time]))) and digi is not None:
-            binlc['bin_cadence']+=[np.array([cads[digi==d] if type(cads[digi==d])==str else cads[digi==d][0] for d in np.unique(digi)])[:,np.newaxis]]
+                    binlc[fkey]+=[np.column_stack((seg_time,lc[fkey][seg_ix],seg_err))]
+        if do_bin and digi is not None:
+            #Taking the cadence of the first point in each occupied bin in one gather (rather than masking per bin):
+            binlc['bin_cadence']+=[cads[np.unique(digi,return_index=True)[1]][:,np.newaxis]]
         else:
             if cads is not None:
                 binlc['bin_cadence']+=[cads[:,np.newaxis]]
@@ -1470,10 +1488,12 @@ def create_transit_mask(t,tcens,tdurs,maskdist=1.1):
 def dopolyfit(win,mask=None,stepcent=0.0,d=3,ni=10,sigclip=3):
     mask=np.tile(True,len(win)) if mask is None else mask
     maskedwin=win[mask]
+    #The inverse variance is fixed across iterations, so we only compute it (and the weights) once:
+    inv_var=1.0/maskedwin[:,2]**2
 
     #initial fit and llk:
-    best_base = np.polyfit(maskedwin[:,0]-stepcent,maskedwin[:,1],w=1.0/maskedwin[:,2]**2,deg=d)
-    best_offset = (maskedwin[:,1]-np.polyval(best_base,maskedwin[:,0]))**2/maskedwin[:,2]**2
+    best_base = np.polyfit(maskedwin[:,0]-stepcent,maskedwin[:,1],w=inv_var,deg=d)
+    best_offset = (maskedwin[:,1]-np.polyval(best_base,maskedwin[:,0]))**2*inv_var
     best_llk=-0.5 * np.sum(best_offset)
 
     #initialising this "random mask"
@@ -1487,9 +1507,9 @@ def dopolyfit(win,mask=None,stepcent=0.0,d=3,ni=10,sigclip=3):
         randmask = np.tile(True,len(maskedwin)) if np.sum(randmask)==0 else randmask
 
         new_base = np.polyfit(maskedwin[randmask,0]-stepcent,maskedwin[randmask,1],
-                              w=1.0/np.power(maskedwin[randmask,2],2),deg=d)
+                              w=inv_var[randmask],deg=d)
         #winsigma = np.std(win[:,1]-np.polyval(base,win[:,0]))
-        new_offset = (maskedwin[:,1]-np.polyval(new_base,maskedwin[:,0]))**2/maskedwin[:,2]**2
+        new_offset = (maskedwin[:,1]-np.polyval(new_base,maskedwin[:,0]))**2*inv_var
         new_llk=-0.5 * np.sum(new_offset)
         if new_llk>best_llk:
             #If that fit is better than the last one, we update the offsets and the llk:
@@ -1810,6 +1830,7 @@ def PlotCorner(trace, ID, mission='TESS', varnames=["b", "ecc", "period", "r_pl"
     #Plotting corner of the parameters to see correlations
     import corner
     import matplotlib.pyplot as plt
+    import pymc3 as pm
     print("varnames = ",varnames)
 
     if savename is None:
@@ -1859,6 +1880,7 @@ def vals_to_latex(vals):
 def ToLatexTable(trace, ID, mission='TESS', varnames='all',order='columns',
                savename=None, overwrite=False, savefileloc=None, tracemask=None):
     #Plotting corner of the parameters to see correlations
+    import pymc3 as pm
     print("MakingLatexTable")
     if savename is None:
         savename=GetSavename(ID, mission, how='save', suffix='_table.txt',overwrite=False, savefileloc=savefileloc)[0]
@@ -2105,9 +2127,11 @@ def robust_mean(y, cut):
     # Compensate the estimate of sigma due to trimming away outliers. The
     # following formula is an approximation, see
     # http://w.astro.berkeley.edu/~johnjohn/idlprocs/robust_mean.pro.
-    sc = np.max([cut, 1.0])
-    if sc <= 4.5:
-        sigma /= (-0.15405 + 0.90723 * sc - 0.23584 * sc**2 + 0.020142 * sc**3)
+    # The cubic only depends on cut, so it is evaluated once (in Horner form) and
+    # re-used for both passes.
+    sc = max(cut, 1.0)
+    trim_corr = -0.15405 + sc * (0.90723 + sc * (-0.23584 + sc * 0.020142)) if sc <= 4.5 else 1.0
+    sigma /= trim_corr
 
     # Identify outliers using our second estimate of the standard deviation of y.
     mask = absdev <= cut * sigma
@@ -2117,9 +2141,7 @@ def robust_mean(y, cut):
     sigma = np.std(y[mask])
 
     # Compensate the estimate of sigma due to trimming away outliers.
-    sc = np.max([cut, 1.0])
-    if sc <= 4.5:
-        sigma /= (-0.15405 + 0.90723 * sc - 0.23584 * sc**2 + 0.020142 * sc**3)
+    sigma /= trim_corr
 
     # Final estimate is the sample mean with outliers removed.
     mean = np.mean(y[mask])
@@ -2271,6 +2293,8 @@ def update_period_w_tls(time,flux,per,N_search_pers=200,per_range_search=0.01,ov
 
 def iteratively_determine_GP_params(pmmodel,time,flux,flux_err,tdurs,debug=False):
     """Iteratively determining best start parameter arrays for SHO GP kernel w0 and power."""
+    import pymc3 as pm
+    import pymc3_ext as pmx
     with pmmodel:
         av_dur = np.nanmean(tdurs)
         #freqs bounded from 2pi/10 to 2pi/2, but seauentially increasing these bounds until the estimate_inverse_gamma_parameters works